@@ -1,6 +1,9 @@
 import inspect
 import functools
+import importlib
+import operator
 import re
+import textwrap
 import traceback
 import typing as ty
 import warnings
@@ -14,10 +17,11 @@ from docutils import nodes
 from docutils.parsers import rst
 from docutils.parsers.rst import directives
 from docutils import statemachine
-from sphinx import application
 from sphinx.util import logging
 from sphinx.util import nodes as sphinx_nodes
-from sphinx.ext.autodoc import mock
+
+if ty.TYPE_CHECKING:
+    from sphinx import application
 
 LOG = logging.getLogger(__name__)
 
@@ -26,20 +30,68 @@ NESTED_SHORT = 'short'
 NESTED_NONE = 'none'
 NestedT = ty.Literal['full', 'short', 'none', None]
 
-ANSI_ESC_SEQ_RE = re.compile(r'\x1B\[\d+(;\d+){0,2}m', flags=re.MULTILINE)
+# the valid values for ':nested:', in the order they're reported in errors
+_NESTED_VALUES = (NESTED_FULL, NESTED_SHORT, NESTED_NONE, None)
+
+ANSI_ESC_SEQ_RE = re.compile(r'\x1B\[\d+(;\d+){0,2}m')
+
+# a single level of indentation, for the hot paths that only ever need one
+_IND1 = '    '
+
+# characters that statemachine.string2lines needs to convert or expand
+_NEEDS_NORMALIZE_RE = re.compile(r'[\t\v\f]')
+
+# Cache of loaded commands, and the files they were defined in, keyed on the
+# directive argument. This is reset whenever a new builder is
+# initialized.
+_MODULE_CACHE: ty.Dict[
+    str, ty.Tuple[ty.Union[click.Command, click.Group], ty.Tuple[str, ...]]
+] = {}
+
+# Cache of the subcommands loaded from a multi-command. This is keyed on the
+# identity of the multi-command (click objects aren't reliably hashable) and
+# also stores the multi-command itself, both to guard against identity reuse
+# and to keep it alive for as long as the entry exists. This is reset along
+# with the module cache.
+_LAZYLOAD_CACHE: ty.Dict[int, ty.Tuple[click.Command, ty.Dict[str, click.Command]]] = {}
 
-_T_Formatter = ty.Callable[[click.Context], ty.Generator[str, None, None]]
+# Deprecated options that we've already warned about. This is reset along with
+# the module cache.
+_DEPRECATIONS_WARNED: ty.Set[str] = set()
+
+# Cache of the lines generated for a command, keyed on the identity of the
+# command along with everything else that can affect its output. This lets the
+# same command be documented by several directives without being reformatted
+# each time. Lines that event handlers have seen aren't stored, as handlers may
+# depend on more than the command, like the document being read. This is reset
+# along with the module cache.
+_LINES_CACHE: ty.Dict[ty.Tuple[ty.Any, ...], ty.Tuple[click.Command, ty.List[str]]] = {}
+
+_EVENTS = (
+    'sphinx-click-process-description',
+    'sphinx-click-process-usage',
+    'sphinx-click-process-options',
+    'sphinx-click-process-arguments',
+    'sphinx-click-process-envvars',
+    'sphinx-click-process-epilog',
+)
+
+_T_Formatter = ty.Callable[..., ty.List[str]]
 
 
 def _process_lines(event_name: str) -> ty.Callable[[_T_Formatter], _T_Formatter]:
     def decorator(func: _T_Formatter) -> _T_Formatter:
         @functools.wraps(func)
-        def process_lines(ctx: click.Context) -> ty.Generator[str, None, None]:
-            lines = list(func(ctx))
+        def process_lines(ctx: click.Context, *args: ty.Any) -> ty.List[str]:
+            lines = func(ctx, *args)
             if "sphinx-click-env" in ctx.meta:
-                ctx.meta["sphinx-click-env"].app.events.emit(event_name, ctx, lines)
-            for line in lines:
-                yield line
+                results = ctx.meta["sphinx-click-env"].app.events.emit(
+                    event_name, ctx, lines
+                )
+                # there's a result for every handler called, whatever it returns
+                if results:
+                    ctx.meta["sphinx-click-processed"] = True
+            return lines
 
         return process_lines
 
@@ -47,21 +99,60 @@ def _process_lines(event_name: str) -> ty.Callable[[_T_Formatter], _T_Formatter]
 
 
 def _indent(text: str, level: int = 1) -> str:
-    prefix = ' ' * (4 * level)
+    prefix = _IND1 * level
+
+    # we're almost always indenting a single line. This has to allow for all
+    # the line breaks 'textwrap.indent' splits on, none of which are printable
+    if text.isprintable():
+        return prefix + text if text.strip() else text
+
+    # whitespace-only lines are left untouched by default
+    return textwrap.indent(text, prefix)
 
-    def prefixed_lines() -> ty.Generator[str, None, None]:
-        for line in text.splitlines(True):
-            yield (prefix + line if line.strip() else line)
 
-    return ''.join(prefixed_lines())
+def _indent_lines(lines: ty.Iterable[str]) -> ty.Iterator[str]:
+    """Indent each of a sequence of lines by a single level."""
+    # lines are already right-stripped so only blank lines are falsey
+    return (_IND1 + line if line else line for line in lines)
+
+
+def _strip_ansi(text: str) -> str:
+    """Remove ANSI escape sequences from text."""
+    # most help strings have no escape sequences at all
+    if '\x1b' not in text:
+        return text
+
+    return ANSI_ESC_SEQ_RE.sub('', text)
+
+
+@functools.lru_cache(maxsize=1024)
+def _string2lines(text: str) -> ty.Tuple[str, ...]:
+    """Split text into lines, as ``statemachine.string2lines`` would.
+
+    Most help strings contain no tabs, vertical tabs or form feeds, in which
+    case there's no need for the whitespace conversion and tab expansion done
+    by docutils. Like ``_help_lines``, the result is cached and so immutable.
+    """
+    if _NEEDS_NORMALIZE_RE.search(text) is None:
+        return tuple(line.rstrip() for line in text.splitlines())
+
+    return tuple(statemachine.string2lines(text, tab_width=4, convert_whitespace=True))
+
+
+@functools.lru_cache(maxsize=None)
+def _section_ids(command_path: str) -> ty.Tuple[str, str]:
+    """Return the id and normalized name of the section for a command."""
+    return nodes.make_id(command_path), nodes.fully_normalize_name(command_path)
 
 
 def _get_usage(ctx: click.Context) -> str:
-    """Alternative, non-prefixed version of 'get_usage'."""
-    formatter = ctx.make_formatter()
+    """Alternative, non-prefixed version of 'get_usage'.
+
+    Unlike click, we don't wrap the usage to the terminal width: it's rendered
+    in a code block and shouldn't depend on the terminal running the build.
+    """
     pieces = ctx.command.collect_usage_pieces(ctx)
-    formatter.write_usage(ctx.command_path, ' '.join(pieces), prefix='')
-    return formatter.getvalue().rstrip('\n')  # type: ignore
+    return ' '.join([ctx.command_path, *pieces])
 
 
 def _get_help_record(ctx: click.Context, opt: click.core.Option) -> ty.Tuple[str, str]:
@@ -74,6 +165,17 @@ def _get_help_record(ctx: click.Context, opt: click.core.Option) -> ty.Tuple[str
 
     [1] http://www.sphinx-doc.org/en/stable/domains.html#directive-option
     """
+    # an option shared between commands, such as under ':nested: full', need
+    # only be formatted once. The records are kept in the context's meta, which
+    # is shared by the whole context chain of a directive, so they can't
+    # outlive the options they're keyed on
+    records: ty.Dict[ty.Tuple[int, ty.Any], ty.Tuple[str, str]] = ctx.meta.setdefault(
+        'sphinx-click-help-records', {}
+    )
+    key = (id(opt), ctx.show_default)
+    cached = records.get(key)
+    if cached is not None:
+        return cached
 
     def _write_opts(opts: ty.List[str]) -> str:
         rv, _ = click.formatting.join_options(opts)
@@ -81,7 +183,7 @@ def _get_help_record(ctx: click.Context, opt: click.core.Option) -> ty.Tuple[str
             name = opt.name
             if opt.metavar:
                 name = opt.metavar.lstrip('<[{($').rstrip('>]})$')
-            rv += ' <{}>'.format(name)
+            rv += f' <{name}>'
         return rv  # type: ignore
 
     rv = [_write_opts(opt.opts)]
@@ -91,160 +193,176 @@ def _get_help_record(ctx: click.Context, opt: click.core.Option) -> ty.Tuple[str
     out = []
     if opt.help:
         if opt.required:
-            out.append('**Required** %s' % opt.help)
+            out.append(f'**Required** {opt.help}')
         else:
             out.append(opt.help)
     else:
         if opt.required:
             out.append('**Required**')
 
-    extras = []
-
     if opt.show_default is not None:
         show_default = opt.show_default
     else:
         show_default = ctx.show_default
 
+    default = None
     if isinstance(show_default, str):
         # Starting from Click 7.0 show_default can be a string. This is
         # mostly useful when the default is not a constant and
         # documentation thus needs a manually written string.
-        extras.append(':default: ``%r``' % ANSI_ESC_SEQ_RE.sub('', show_default))
+        default = f':default: ``{_strip_ansi(show_default)!r}``'
     elif show_default and opt.default is not None:
-        extras.append(
-            ':default: ``%s``'
-            % (
-                ', '.join(repr(d) for d in opt.default)
-                if isinstance(opt.default, (list, tuple))
-                else repr(opt.default)
-            )
-        )
+        # most defaults are scalars so handle those first
+        if not isinstance(opt.default, (list, tuple)):
+            default_str = repr(opt.default)
+        else:
+            default_str = ', '.join([repr(d) for d in opt.default])
+        default = f':default: ``{default_str}``'
 
+    choices = None
     if isinstance(opt.type, click.Choice):
-        extras.append(':options: %s' % ' | '.join(str(x) for x in opt.type.choices))
+        choices = f":options: {' | '.join(str(x) for x in opt.type.choices)}"
 
-    if extras:
+    # most options have neither so we avoid collecting these in a list
+    if default or choices:
         if out:
             out.append('')
 
-        out.extend(extras)
+        if default:
+            out.append(default)
+
+        if choices:
+            out.append(choices)
 
-    return ', '.join(rv), '\n'.join(out)
+    record = ', '.join(rv), '\n'.join(out)
 
+    records[key] = record
+    return record
 
-def _format_help(help_string: str) -> ty.Generator[str, None, None]:
-    help_string = inspect.cleandoc(ANSI_ESC_SEQ_RE.sub('', help_string))
 
+@functools.lru_cache(maxsize=1024)
+def _help_lines(help_string: str, cleandoc: bool = True) -> ty.Tuple[str, ...]:
+    """Strip ANSI escape sequences from help text and split it into lines.
+
+    Paragraphs following click's ``\\b`` marker are turned into line blocks so
+    that their wrapping is preserved. Help text is frequently shared between
+    commands so the result is cached, and is therefore immutable.
+    """
+    help_string = _strip_ansi(help_string)
+
+    # the common case is a plain one-liner, which would come out unchanged.
+    # Line breaks, tabs and click's '\b' marker aren't printable
+    if help_string.isprintable() and help_string == help_string.strip():
+        return (help_string,) if help_string else ()
+
+    if cleandoc:
+        help_string = inspect.cleandoc(help_string)
+
+    lines = []
     bar_enabled = False
-    for line in statemachine.string2lines(
-        help_string, tab_width=4, convert_whitespace=True
-    ):
+    for line in _string2lines(help_string):
         if line == '\b':
             bar_enabled = True
             continue
         if line == '':
             bar_enabled = False
-        line = '| ' + line if bar_enabled else line
-        yield line
-    yield ''
+        lines.append('| ' + line if bar_enabled else line)
+
+    return tuple(lines)
+
+
+def _format_help(help_string: str) -> ty.List[str]:
+    return [*_help_lines(help_string), '']
 
 
 @_process_lines("sphinx-click-process-description")
-def _format_description(ctx: click.Context) -> ty.Generator[str, None, None]:
+def _format_description(ctx: click.Context) -> ty.List[str]:
     """Format the description for a given `click.Command`.
 
     We parse this as reStructuredText, allowing users to embed rich
     information in their help messages if they so choose.
     """
     help_string = ctx.command.help or ctx.command.short_help
-    if help_string:
-        yield from _format_help(help_string)
+    if not help_string:
+        return []
+
+    return _format_help(help_string)
 
 
 @_process_lines("sphinx-click-process-usage")
-def _format_usage(ctx: click.Context) -> ty.Generator[str, None, None]:
+def _format_usage(ctx: click.Context) -> ty.List[str]:
     """Format the usage for a `click.Command`."""
-    yield '.. code-block:: shell'
-    yield ''
-    for line in _get_usage(ctx).splitlines():
-        yield _indent(line)
-    yield ''
+    return ['.. code-block:: shell', '', _indent(_get_usage(ctx)), '']
 
 
 def _format_option(
-    ctx: click.Context, opt: click.core.Option
-) -> ty.Generator[str, None, None]:
-    """Format the output for a `click.core.Option`."""
+    ctx: click.Context, opt: click.core.Option, lines: ty.List[str]
+) -> None:
+    """Format the output for a `click.core.Option`.
+
+    The output is appended to lines.
+    """
     opt_help = _get_help_record(ctx, opt)
 
-    yield '.. option:: {}'.format(opt_help[0])
+    lines.append(f'.. option:: {opt_help[0]}')
     if opt_help[1]:
-        yield ''
-        bar_enabled = False
-        for line in statemachine.string2lines(
-            ANSI_ESC_SEQ_RE.sub('', opt_help[1]), tab_width=4, convert_whitespace=True
-        ):
-            if line == '\b':
-                bar_enabled = True
-                continue
-            if line == '':
-                bar_enabled = False
-            line = '| ' + line if bar_enabled else line
-            yield _indent(line)
+        lines.append('')
+        lines.extend(_indent_lines(_help_lines(opt_help[1], cleandoc=False)))
 
 
 @_process_lines("sphinx-click-process-options")
-def _format_options(ctx: click.Context) -> ty.Generator[str, None, None]:
+def _format_options(
+    ctx: click.Context, params: ty.List[click.core.Option]
+) -> ty.List[str]:
     """Format all `click.Option` for a `click.Command`."""
-    # the hidden attribute is part of click 7.x only hence use of getattr
-    params = [
-        param
-        for param in ctx.command.params
-        if isinstance(param, click.core.Option) and not getattr(param, 'hidden', False)
-    ]
-
+    lines: ty.List[str] = []
     for param in params:
-        for line in _format_option(ctx, param):
-            yield line
-        yield ''
-
-
-def _format_argument(arg: click.Argument) -> ty.Generator[str, None, None]:
-    """Format the output of a `click.Argument`."""
-    yield '.. option:: {}'.format(arg.human_readable_name)
-    yield ''
-    yield _indent(
-        '{} argument{}'.format(
-            'Required' if arg.required else 'Optional', '(s)' if arg.nargs != 1 else ''
-        )
+        _format_option(ctx, param, lines)
+        lines.append('')
+
+    return lines
+
+
+def _format_argument(arg: click.Argument, lines: ty.List[str]) -> None:
+    """Format the output of a `click.Argument`.
+
+    The output is appended to lines.
+    """
+    lines.append(f'.. option:: {arg.human_readable_name}')
+    lines.append('')
+    lines.append(
+        f"{_IND1}{'Required' if arg.required else 'Optional'} argument"
+        f"{'(s)' if arg.nargs != 1 else ''}"
     )
     # Subclasses of click.Argument may add a `help` attribute (like typer.main.TyperArgument)
     help = getattr(arg, 'help', None)
     if help:
-        yield ''
-        help_string = ANSI_ESC_SEQ_RE.sub('', help)
-        for line in _format_help(help_string):
-            yield _indent(line)
+        lines.append('')
+        lines.extend(_indent_lines(_format_help(help)))
 
 
 @_process_lines("sphinx-click-process-arguments")
-def _format_arguments(ctx: click.Context) -> ty.Generator[str, None, None]:
+def _format_arguments(
+    ctx: click.Context, params: ty.List[click.Argument]
+) -> ty.List[str]:
     """Format all `click.Argument` for a `click.Command`."""
-    params = [x for x in ctx.command.params if isinstance(x, click.Argument)]
-
+    lines: ty.List[str] = []
     for param in params:
-        for line in _format_argument(param):
-            yield line
-        yield ''
+        _format_argument(param, lines)
+        lines.append('')
+
+    return lines
 
 
 def _format_envvar(
     param: ty.Union[click.core.Option, click.Argument],
-) -> ty.Generator[str, None, None]:
-    """Format the envvars of a `click.Option` or `click.Argument`."""
-    yield '.. envvar:: {}'.format(param.envvar)
-    yield '   :noindex:'
-    yield ''
+    envvar: str,
+    lines: ty.List[str],
+) -> None:
+    """Format the envvars of a `click.Option` or `click.Argument`.
+
+    The output is appended to lines.
+    """
     if isinstance(param, click.Argument):
         param_ref = param.human_readable_name
     else:
@@ -252,65 +370,99 @@ def _format_envvar(
         # first. For example, if '--foo' or '-f' are possible, use '--foo'.
         param_ref = param.opts[0]
 
-    yield _indent('Provide a default for :option:`{}`'.format(param_ref))
+    lines.append(f'.. envvar:: {envvar}')
+    lines.append('   :noindex:')
+    lines.append('')
+    lines.append(f'{_IND1}Provide a default for :option:`{param_ref}`')
 
 
 @_process_lines("sphinx-click-process-envars")
-def _format_envvars(ctx: click.Context) -> ty.Generator[str, None, None]:
+def _format_envvars(
+    ctx: click.Context, params: ty.List[click.Parameter]
+) -> ty.List[str]:
     """Format all envvars for a `click.Command`."""
 
     auto_envvar_prefix = ctx.auto_envvar_prefix
-    if auto_envvar_prefix is not None:
-        params = []
-        for param in ctx.command.params:
-            if not param.envvar:
-                param.envvar = f"{auto_envvar_prefix}_{param.name.upper()}"
-            params.append(param)
-    else:
-        params = [x for x in ctx.command.params if x.envvar]
 
+    # 'command_path' walks the parent chain so only build the name once
+    command_name = ctx.command_path.replace(' ', '-')
+
+    lines: ty.List[str] = []
     for param in params:
-        yield '.. _{command_name}-{param_name}-{envvar}:'.format(
-            command_name=ctx.command_path.replace(' ', '-'),
-            param_name=param.name,
-            envvar=param.envvar,
+        # parameters without an explicit envvar are only passed to us when
+        # there's an automatic one. click derives those when resolving values
+        # rather than storing them on the parameter, and we mustn't modify the
+        # parameter either since it may be documented again
+        envvar = (
+            getattr(param, 'envvar', None)
+            or f'{auto_envvar_prefix}_{param.name.upper()}'
         )
-        yield ''
-        for line in _format_envvar(param):
-            yield line
-        yield ''
+
+        lines.append(f'.. _{command_name}-{param.name}-{envvar}:')
+        lines.append('')
+        _format_envvar(param, envvar, lines)
+        lines.append('')
+
+    return lines
 
 
-def _format_subcommand(command: click.Command) -> ty.Generator[str, None, None]:
-    """Format a sub-command of a `click.Command` or `click.Group`."""
-    yield '.. object:: {}'.format(command.name)
+def _format_subcommand(command: click.Command, lines: ty.List[str]) -> None:
+    """Format a sub-command of a `click.Command` or `click.Group`.
+
+    The output is appended to lines.
+    """
+    lines.append(f'.. object:: {command.name}')
+
+    # undocumented commands are common enough in generated or plugin CLIs that
+    # it's worth avoiding the work of building a short help string for them.
+    # Note that click labels deprecated commands, even when there's no help
+    if not (command.short_help or command.help or command.deprecated):
+        return
 
     short_help = command.get_short_help_str()
 
     if short_help:
-        yield ''
-        for line in statemachine.string2lines(
-            short_help, tab_width=4, convert_whitespace=True
-        ):
-            yield _indent(line)
+        lines.append('')
+        lines.extend(_indent_lines(_string2lines(short_help)))
 
 
 @_process_lines("sphinx-click-process-epilog")
-def _format_epilog(ctx: click.Context) -> ty.Generator[str, None, None]:
+def _format_epilog(ctx: click.Context) -> ty.List[str]:
     """Format the epilog for a given `click.Command`.
 
     We parse this as reStructuredText, allowing users to embed rich
     information in their help messages if they so choose.
     """
-    if ctx.command.epilog:
-        yield from _format_help(ctx.command.epilog)
+    if not ctx.command.epilog:
+        return []
+
+    return _format_help(ctx.command.epilog)
+
 
+def _get_lazyload_commands(
+    ctx: click.Context,
+    names: ty.Optional[ty.List[str]] = None,
+) -> ty.Dict[str, click.Command]:
+    # loading commands can be expensive (they may well be imported on demand)
+    # so we only do it once for a given multi-command
+    cached = _LAZYLOAD_CACHE.get(id(ctx.command))
+    if cached is not None and cached[0] is ctx.command:
+        return cached[1]
+
+    # if we only want some of the commands, only load those
+    if names is not None:
+        available = set(ctx.command.list_commands(ctx))
+        return {
+            name: ctx.command.get_command(ctx, name)
+            for name in names
+            if name in available
+        }
 
-def _get_lazyload_commands(ctx: click.Context) -> ty.Dict[str, click.Command]:
     commands = {}
     for command in ctx.command.list_commands(ctx):
         commands[command] = ctx.command.get_command(ctx, command)
 
+    _LAZYLOAD_CACHE[id(ctx.command)] = (ctx.command, commands)
     return commands
 
 
@@ -321,10 +473,10 @@ def _filter_commands(
     """Return list of used commands."""
     lookup = getattr(ctx.command, 'commands', {})
     if not lookup and isinstance(ctx.command, click.MultiCommand):
-        lookup = _get_lazyload_commands(ctx)
+        lookup = _get_lazyload_commands(ctx, commands)
 
     if commands is None:
-        return sorted(lookup.values(), key=lambda item: item.name)
+        return sorted(lookup.values(), key=operator.attrgetter('name'))
 
     return [lookup[command] for command in commands if command in lookup]
 
@@ -333,87 +485,96 @@ def _format_command(
     ctx: click.Context,
     nested: NestedT,
     commands: ty.Optional[ty.List[str]] = None,
-) -> ty.Generator[str, None, None]:
+) -> ty.List[str]:
     """Format the output of `click.Command`."""
     if ctx.command.hidden:
-        return None
+        return []
 
     # description
 
-    for line in _format_description(ctx):
-        yield line
+    lines = _format_description(ctx)
 
-    yield '.. program:: {}'.format(ctx.command_path)
+    lines.append(f'.. program:: {ctx.command_path}')
 
     # usage
 
-    for line in _format_usage(ctx):
-        yield line
+    lines.extend(_format_usage(ctx))
+
+    # bin the parameters in a single pass rather than walking them once for
+    # each of the options, arguments and environment variables sections
+
+    options = []
+    arguments = []
+    envvars = []
+    auto_envvars = ctx.auto_envvar_prefix is not None
+    for param in ctx.command.params:
+        if isinstance(param, click.core.Option):
+            # the hidden attribute is part of click 7.x only hence use of getattr
+            if not getattr(param, 'hidden', False):
+                options.append(param)
+        elif isinstance(param, click.Argument):
+            arguments.append(param)
+
+        # custom parameter types needn't have an envvar attribute
+        if auto_envvars or getattr(param, 'envvar', None):
+            envvars.append(param)
 
     # options
 
-    lines = list(_format_options(ctx))
-    if lines:
+    section = _format_options(ctx, options)
+    if section:
         # we use rubric to provide some separation without exploding the table
         # of contents
-        yield '.. rubric:: Options'
-        yield ''
-
-    for line in lines:
-        yield line
+        lines.append('.. rubric:: Options')
+        lines.append('')
+        lines.extend(section)
 
     # arguments
 
-    lines = list(_format_arguments(ctx))
-    if lines:
-        yield '.. rubric:: Arguments'
-        yield ''
-
-    for line in lines:
-        yield line
+    section = _format_arguments(ctx, arguments)
+    if section:
+        lines.append('.. rubric:: Arguments')
+        lines.append('')
+        lines.extend(section)
 
     # environment variables
 
-    lines = list(_format_envvars(ctx))
-    if lines:
-        yield '.. rubric:: Environment variables'
-        yield ''
-
-    for line in lines:
-        yield line
+    section = _format_envvars(ctx, envvars)
+    if section:
+        lines.append('.. rubric:: Environment variables')
+        lines.append('')
+        lines.extend(section)
 
     # description
 
-    for line in _format_epilog(ctx):
-        yield line
+    lines.extend(_format_epilog(ctx))
 
     # if we're nesting commands, we need to do this slightly differently
-    if nested in (NESTED_FULL, NESTED_NONE):
-        return
+    if nested == NESTED_FULL or nested == NESTED_NONE:
+        return lines
 
     command_objs = _filter_commands(ctx, commands)
 
     if command_objs:
-        yield '.. rubric:: Commands'
-        yield ''
+        lines.append('.. rubric:: Commands')
+        lines.append('')
 
     for command_obj in command_objs:
         # Don't show hidden subcommands
         if command_obj.hidden:
             continue
 
-        for line in _format_subcommand(command_obj):
-            yield line
-        yield ''
+        _format_subcommand(command_obj, lines)
+        lines.append('')
 
+    return lines
 
-def nested(argument: ty.Optional[str]) -> NestedT:
-    values = (NESTED_FULL, NESTED_SHORT, NESTED_NONE, None)
 
-    if argument not in values:
+def nested(argument: ty.Optional[str]) -> NestedT:
+    if argument not in _NESTED_VALUES:
         raise ValueError(
-            "%s is not a valid value for ':nested:'; allowed values: %s"
-            % directives.format_values(values)
+            f"{argument} is not a valid value for ':nested:'; allowed values: "
+            f"{directives.format_values(_NESTED_VALUES)}"
         )
 
     return ty.cast(NestedT, argument)
@@ -431,40 +592,68 @@ class ClickDirective(rst.Directive):
 
     def _load_module(self, module_path: str) -> ty.Union[click.Command, click.Group]:
         """Load the module."""
+        cached = _MODULE_CACHE.get(module_path)
+        if cached is not None:
+            for source_file in cached[1]:
+                self.env.note_dependency(source_file)
+            return cached[0]
 
         try:
             module_name, attr_name = module_path.split(':', 1)
         except ValueError:  # noqa
-            raise self.error(
-                '"{}" is not of format "module:parser"'.format(module_path)
-            )
+            raise self.error(f'"{module_path}" is not of format "module:parser"')
+
+        # autodoc is only needed for mocking so we defer importing it until
+        # we actually load something
+        from sphinx.ext.autodoc import mock
 
         try:
             with mock(self.env.config.sphinx_click_mock_imports):
-                mod = __import__(module_name, globals(), locals(), [attr_name])
+                mod = importlib.import_module(module_name)
         except (Exception, SystemExit) as exc:  # noqa
-            err_msg = 'Failed to import "{}" from "{}". '.format(attr_name, module_name)
+            err_msg = f'Failed to import "{attr_name}" from "{module_name}". '
             if isinstance(exc, SystemExit):
                 err_msg += 'The module appeared to call sys.exit()'
             else:
-                err_msg += 'The following exception was raised:\n{}'.format(
-                    traceback.format_exc()
+                err_msg += (
+                    f'The following exception was raised:\n{traceback.format_exc()}'
                 )
 
             raise self.error(err_msg)
 
-        if not hasattr(mod, attr_name):
-            raise self.error(
-                'Module "{}" has no attribute "{}"'.format(module_name, attr_name)
-            )
-
-        parser = getattr(mod, attr_name)
+        try:
+            parser = getattr(mod, attr_name)
+        except AttributeError:
+            raise self.error(f'Module "{module_name}" has no attribute "{attr_name}"')
 
         if not isinstance(parser, (click.Command, click.Group)):
             raise self.error(
-                '"{}" of type "{}" is not click.Command or click.Group.'
-                '"click.BaseCommand"'.format(type(parser), module_path)
+                f'"{module_path}" of type "{type(parser)}" is not click.Command or '
+                'click.Group.'
             )
+
+        # ensure the document is re-read if the module defining the command
+        # changes, otherwise incremental builds would show stale output. The
+        # command may have been imported from elsewhere, so we also track the
+        # file defining its callback. Subcommands defined in other modules
+        # aren't tracked, however
+        source_files = []
+        module_file = getattr(mod, '__file__', None)
+        if module_file:
+            source_files.append(module_file)
+
+        if parser.callback is not None:
+            try:
+                callback_file = inspect.getfile(inspect.unwrap(parser.callback))
+            except TypeError:  # builtins and the like have no file
+                callback_file = None
+            if callback_file and callback_file not in source_files:
+                source_files.append(callback_file)
+
+        for source_file in source_files:
+            self.env.note_dependency(source_file)
+
+        _MODULE_CACHE[module_path] = (parser, tuple(source_files))
         return parser
 
     def _generate_nodes(
@@ -490,35 +679,61 @@ class ClickDirective(rst.Directive):
             `click.CommandCollection`.
         :returns: A list of nested docutil nodes
         """
-        ctx = click.Context(command, info_name=name, parent=parent)
-
         if command.hidden:
             return []
 
+        ctx = click.Context(command, info_name=name, parent=parent)
+
+        # 'command_path' is recomputed from the parent chain on every access
+        command_path = ctx.command_path
+
         # Title
 
+        section_id, section_name = _section_ids(command_path)
         section = nodes.section(
             '',
             nodes.title(text=name),
-            ids=[nodes.make_id(ctx.command_path)],
-            names=[nodes.fully_normalize_name(ctx.command_path)],
+            ids=[section_id],
+            names=[section_name],
         )
 
         # Summary
-        source_name = ctx.command_path
-        result = statemachine.StringList()
+        source_name = command_path
 
         ctx.meta["sphinx-click-env"] = self.env
-        if semantic_group:
-            lines = _format_description(ctx)
+        key = (
+            id(command),
+            command_path,
+            nested,
+            tuple(commands) if commands is not None else None,
+            semantic_group,
+            ctx.auto_envvar_prefix,
+            ctx.show_default,
+        )
+        cached = _LINES_CACHE.get(key)
+        if cached is not None and cached[0] is command:
+            lines = cached[1]
         else:
-            lines = _format_command(ctx, nested, commands)
-
-        for line in lines:
-            LOG.debug(line)
-            result.append(line, source_name)
-
-        sphinx_nodes.nested_parse_with_titles(self.state, result, section)
+            ctx.meta["sphinx-click-processed"] = False
+            if semantic_group:
+                lines = _format_description(ctx)
+            else:
+                lines = _format_command(ctx, nested, commands)
+            if not ctx.meta["sphinx-click-processed"]:
+                _LINES_CACHE[key] = (command, lines)
+
+        # a single record, rather than one per line, as the level is left to
+        # Sphinx's handlers to filter
+        LOG.debug('\n'.join(lines))
+
+        # the content is generated reStructuredText, which we must parse rather
+        # than build nodes for directly: event handlers are free to rewrite it,
+        # and directives like 'option' and 'program' register targets with the
+        # std domain as they're parsed. There's no need to spin up the parser
+        # for empty content, however.
+        if lines:
+            result = statemachine.StringList(lines, source_name)
+            sphinx_nodes.nested_parse_with_titles(self.state, result, section)
 
         # Subcommands
 
@@ -564,10 +779,14 @@ class ClickDirective(rst.Directive):
                     "':nested:' and ':show-nested:' are mutually exclusive"
                 )
             else:
-                warnings.warn(
-                    "':show-nested:' is deprecated; use ':nested: full'",
-                    DeprecationWarning,
-                )
+                # only warn once per build, or once per worker for parallel
+                # builds, rather than for every directive
+                if 'show-nested' not in _DEPRECATIONS_WARNED:
+                    _DEPRECATIONS_WARNED.add('show-nested')
+                    warnings.warn(
+                        "':show-nested:' is deprecated; use ':nested: full'",
+                        DeprecationWarning,
+                    )
                 nested = NESTED_FULL if show_nested else NESTED_SHORT
 
         commands = None
@@ -579,20 +798,26 @@ class ClickDirective(rst.Directive):
         return self._generate_nodes(prog_name, command, None, nested, commands)
 
 
-def setup(app: application.Sphinx) -> ty.Dict[str, ty.Any]:
+def _clear_caches(app: 'application.Sphinx') -> None:
+    """Drop anything cached from a previous build."""
+    _MODULE_CACHE.clear()
+    _LAZYLOAD_CACHE.clear()
+    _LINES_CACHE.clear()
+    _DEPRECATIONS_WARNED.clear()
+    _section_ids.cache_clear()
+
+
+def setup(app: 'application.Sphinx') -> ty.Dict[str, ty.Any]:
     # Need autodoc to support mocking modules
     app.setup_extension('sphinx.ext.autodoc')
     app.add_directive('click', ClickDirective)
 
-    app.add_event("sphinx-click-process-description")
-    app.add_event("sphinx-click-process-usage")
-    app.add_event("sphinx-click-process-options")
-    app.add_event("sphinx-click-process-arguments")
-    app.add_event("sphinx-click-process-envvars")
-    app.add_event("sphinx-click-process-epilog")
+    for event in _EVENTS:
+        app.add_event(event)
     app.add_config_value(
         'sphinx_click_mock_imports', lambda config: config.autodoc_mock_imports, 'env'
     )
+    app.connect('builder-inited', _clear_caches)
 
     return {
         'parallel_read_safe': True,
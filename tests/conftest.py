@@ -1,5 +1,6 @@
 import pathlib
 import shutil
+import sys
 
 import sphinx
 import pytest
@@ -26,4 +27,11 @@ def rootdir(tmpdir):
         roots = path.path(dst)
 
     yield roots
+
+    # the roots are copied for every test, so forget any modules imported from
+    # this copy rather than letting the next test reuse them
+    for name, module in list(sys.modules.items()):
+        if (getattr(module, '__file__', None) or '').startswith(str(dst)):
+            del sys.modules[name]
+
     shutil.rmtree(dst)
@@ -0,0 +1,3 @@
+"""A module with something that isn't a command."""
+
+greet = 'Hello world!'
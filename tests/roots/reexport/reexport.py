@@ -0,0 +1,3 @@
+"""A module re-exporting a command defined elsewhere."""
+
+from reexport_commands import greet  # noqa: F401
@@ -0,0 +1,14 @@
+"""The module actually defining the command."""
+
+import click
+
+
+@click.group()
+def greet():
+    """A sample command group."""
+
+
+@greet.command()
+def world():
+    """Greet the world."""
+    click.echo('Hello world!')
@@ -1,8 +1,13 @@
+import importlib
 import pickle
+from unittest import mock
 
+import pytest
 from docutils import nodes
 from sphinx import addnodes as sphinx_nodes
 
+from sphinx_click import ext
+
 
 def test_basics(make_app, rootdir):
     srcdir = rootdir / 'basics'
@@ -49,6 +54,22 @@ def test_basics(make_app, rootdir):
     assert isinstance(section[7], sphinx_nodes.desc)
     assert section[7].astext() == 'world\n\nGreet the world.'
 
+    # the document should be rebuilt if the module defining the command changes
+    dependencies = {str(dependency) for dependency in app.env.dependencies['index']}
+    assert str(app.srcdir / 'basics_greet.py') in dependencies
+
+
+def test_reexport(make_app, rootdir):
+    srcdir = rootdir / 'reexport'
+    app = make_app('xml', srcdir=srcdir)
+    app.build()
+
+    # both the module named in the directive and the one actually defining the
+    # command should be tracked
+    dependencies = {str(dependency) for dependency in app.env.dependencies['index']}
+    assert str(app.srcdir / 'reexport.py') in dependencies
+    assert str(app.srcdir / 'reexport_commands.py') in dependencies
+
 
 def test_commands(make_app, rootdir):
     srcdir = rootdir / 'commands'
@@ -144,3 +165,106 @@ def test_nested_full(make_app, rootdir):
     assert isinstance(subsection_b[1], nodes.paragraph)
     assert subsection_b[1].astext() == 'Greet the world.'
     assert isinstance(subsection_b[2], nodes.literal_block)
+
+
+def test_show_nested(make_app, rootdir):
+    srcdir = rootdir / 'show-nested'
+    app = make_app('xml', srcdir=srcdir)
+
+    with pytest.warns(DeprecationWarning) as record:
+        app.build()
+
+    # we should only warn once, regardless of the number of directives
+    show_nested_warnings = [
+        warning for warning in record if ':show-nested:' in str(warning.message)
+    ]
+    assert len(show_nested_warnings) == 1
+
+    # TODO: rather than using the pickled doctree, we should decode the XML
+    content = pickle.loads((app.doctreedir / 'index.doctree').read_bytes())
+
+    # both directives should be rendered in full
+    for section in content[0][1:]:
+        assert isinstance(section, nodes.section)
+        assert section[0].astext() == 'greet'
+        assert isinstance(section[3], nodes.section)
+        assert section[3][0].astext() == 'hello'
+        assert isinstance(section[4], nodes.section)
+        assert section[4][0].astext() == 'world'
+
+
+def test_repeated(make_app, rootdir):
+    srcdir = rootdir / 'repeated'
+    app = make_app('xml', srcdir=srcdir)
+    app.build()
+
+    # TODO: rather than using the pickled doctree, we should decode the XML
+    index = pickle.loads((app.doctreedir / 'index.doctree').read_bytes())
+    other = pickle.loads((app.doctreedir / 'other.doctree').read_bytes())
+
+    # the second directive reuses the output of the first, which should make
+    # no difference to what's rendered
+    section = index[0][1]
+    assert isinstance(section, nodes.section)
+    assert section[0].astext() == 'greet'
+    assert section.pformat() == other[0][1].pformat()
+
+
+def test_repeated_module(make_app, rootdir):
+    srcdir = rootdir / 'repeated'
+    app = make_app('xml', srcdir=srcdir)
+
+    with mock.patch.object(
+        ext.importlib, 'import_module', wraps=importlib.import_module
+    ) as import_module:
+        app.build()
+
+    # the module should only be loaded for the first directive...
+    imports = [
+        call
+        for call in import_module.call_args_list
+        if call.args[0] == 'repeated_greet'
+    ]
+    assert len(imports) == 1
+
+    # ...but both documents should still be rebuilt if it changes
+    for docname in ('index', 'other'):
+        dependencies = {str(dependency) for dependency in app.env.dependencies[docname]}
+        assert str(app.srcdir / 'repeated_greet.py') in dependencies
+
+
+def test_repeated_with_handler(make_app, rootdir):
+    srcdir = rootdir / 'repeated'
+    app = make_app('xml', srcdir=srcdir)
+
+    calls = []
+
+    def process_usage(app, ctx, lines):
+        calls.append(ctx.command_path)
+
+    app.connect('sphinx-click-process-usage', process_usage)
+    app.build()
+
+    # output seen by handlers can't be reused, so they're called every time
+    assert calls == ['greet', 'greet']
+
+
+def test_invalid_nested():
+    with pytest.raises(ValueError) as exc_info:
+        ext.nested('bogus')
+
+    # the exact punctuation of the list of values depends on docutils
+    message = str(exc_info.value)
+    assert message.startswith("bogus is not a valid value for ':nested:'")
+    for value in ('"full"', '"short"', '"none"', '"None"'):
+        assert value in message
+
+
+def test_invalid_command(make_app, rootdir):
+    srcdir = rootdir / 'invalid-command'
+    app = make_app('xml', srcdir=srcdir)
+    app.build()
+
+    assert (
+        '"invalid:greet" of type "<class \'str\'>" is not click.Command or click.Group.'
+    ) in app.warning.getvalue()
@@ -25,7 +25,7 @@ class CommandTestCase(unittest.TestCase):
             pass
 
         ctx = click.Context(foobar, info_name='foobar')
-        output = list(ext._format_command(ctx, nested='short'))
+        output = ext._format_command(ctx, nested='short')
 
         self.assertEqual(
             textwrap.dedent(
@@ -73,7 +73,7 @@ class CommandTestCase(unittest.TestCase):
             pass
 
         ctx = click.Context(foobar, info_name='foobar')
-        output = list(ext._format_command(ctx, nested='short'))
+        output = ext._format_command(ctx, nested='short')
 
         self.assertEqual(
             textwrap.dedent(
@@ -146,7 +146,7 @@ class CommandTestCase(unittest.TestCase):
             pass
 
         ctx = click.Context(foobar, info_name='foobar')
-        output = list(ext._format_command(ctx, nested='short'))
+        output = ext._format_command(ctx, nested='short')
 
         self.assertEqual(
             textwrap.dedent(
@@ -191,7 +191,7 @@ class CommandTestCase(unittest.TestCase):
             pass
 
         ctx = click.Context(foobar, info_name='foobar')
-        output = list(ext._format_command(ctx, nested='short'))
+        output = ext._format_command(ctx, nested='short')
 
         self.assertEqual(
             textwrap.dedent(
@@ -255,7 +255,7 @@ class CommandTestCase(unittest.TestCase):
             pass
 
         ctx = click.Context(foobar, info_name='foobar')
-        output = list(ext._format_command(ctx, nested='short'))
+        output = ext._format_command(ctx, nested='short')
 
         self.assertEqual(
             textwrap.dedent(
@@ -308,7 +308,7 @@ class CommandTestCase(unittest.TestCase):
             pass
 
         ctx = click.Context(foobar, info_name='foobar', show_default=True)
-        output = list(ext._format_command(ctx, nested='short'))
+        output = ext._format_command(ctx, nested='short')
         self.assertEqual(
             textwrap.dedent(
                 """
@@ -340,7 +340,7 @@ class CommandTestCase(unittest.TestCase):
             pass
 
         ctx = click.Context(foobar, info_name='foobar')
-        output = list(ext._format_command(ctx, nested='short'))
+        output = ext._format_command(ctx, nested='short')
 
         self.assertEqual('', '\n'.join(output))
 
@@ -361,7 +361,7 @@ class CommandTestCase(unittest.TestCase):
             """
 
         ctx = click.Context(hello, info_name='hello')
-        output = list(ext._format_command(ctx, nested='short'))
+        output = ext._format_command(ctx, nested='short')
 
         self.assertEqual(
             textwrap.dedent(
@@ -419,7 +419,7 @@ class CommandTestCase(unittest.TestCase):
             pass
 
         ctx = click.Context(foobar, info_name='foobar')
-        output = list(ext._format_command(ctx, nested='short'))
+        output = ext._format_command(ctx, nested='short')
 
         self.assertEqual(
             textwrap.dedent(
@@ -479,7 +479,7 @@ class CommandTestCase(unittest.TestCase):
             pass
 
         ctx = click.Context(cli, info_name='cli')
-        output = list(ext._format_command(ctx, nested='short'))
+        output = ext._format_command(ctx, nested='short')
 
         # note that we have an extra newline because we're using
         # docutils.statemachine.string2lines under the hood, which is
@@ -505,6 +505,40 @@ class CommandTestCase(unittest.TestCase):
             '\n'.join(output),
         )
 
+    def test_carriage_returns(self):
+        """Validate behavior when help text uses other line breaks."""
+
+        @click.command(
+            help='A sample command.\r\n\r\nWith Windows line endings.\rAnd a lone '
+            'carriage return.'
+        )
+        def foobar():
+            pass
+
+        ctx = click.Context(foobar, info_name='foobar')
+        output = ext._format_command(ctx, nested='short')
+
+        self.assertEqual(
+            textwrap.dedent(
+                """
+        A sample command.
+
+        With Windows line endings.
+        And a lone carriage return.
+
+        .. program:: foobar
+        .. code-block:: shell
+
+            foobar [OPTIONS]
+        """
+            ).lstrip(),
+            '\n'.join(output),
+        )
+
+        # anything indented is split the same way as by textwrap
+        text = 'foobar [OPTIONS]\rA\x0cB'
+        self.assertEqual(textwrap.indent(text, '    '), ext._indent(text))
+
     def test_no_line_wrapping(self):
         r"""Validate behavior when a \b character is present.
 
@@ -551,7 +585,7 @@ that will be rewrapped again.
             pass
 
         ctx = click.Context(cli, info_name='cli')
-        output = list(ext._format_command(ctx, nested='short'))
+        output = ext._format_command(ctx, nested='short')
 
         self.assertEqual(
             textwrap.dedent(
@@ -596,6 +630,48 @@ that will be rewrapped again.
             '\n'.join(output),
         )
 
+    def test_no_usage_wrapping(self):
+        """Validate that long usage strings are not wrapped."""
+
+        @click.command()
+        @click.argument('FIRST_ARGUMENT_WITH_A_LONG_NAME')
+        @click.argument('SECOND_ARGUMENT_WITH_A_LONG_NAME')
+        @click.argument('THIRD_ARGUMENT_WITH_A_LONG_NAME')
+        def cli():
+            """A sample command."""
+            pass
+
+        ctx = click.Context(cli, info_name='cli')
+        output = ext._format_command(ctx, nested='short')
+
+        self.assertEqual(
+            textwrap.dedent(
+                """
+        A sample command.
+
+        .. program:: cli
+        .. code-block:: shell
+
+            cli [OPTIONS] FIRST_ARGUMENT_WITH_A_LONG_NAME SECOND_ARGUMENT_WITH_A_LONG_NAME THIRD_ARGUMENT_WITH_A_LONG_NAME
+
+        .. rubric:: Arguments
+
+        .. option:: FIRST_ARGUMENT_WITH_A_LONG_NAME
+
+            Required argument
+
+        .. option:: SECOND_ARGUMENT_WITH_A_LONG_NAME
+
+            Required argument
+
+        .. option:: THIRD_ARGUMENT_WITH_A_LONG_NAME
+
+            Required argument
+        """
+            ).lstrip(),
+            '\n'.join(output),
+        )
+
 
 class GroupTestCase(unittest.TestCase):
     """Validate basic ``click.Group`` instances."""
@@ -615,7 +691,7 @@ class GroupTestCase(unittest.TestCase):
             pass
 
         ctx = click.Context(cli, info_name='cli')
-        output = list(ext._format_command(ctx, nested='short'))
+        output = ext._format_command(ctx, nested='short')
 
         self.assertEqual(
             textwrap.dedent(
@@ -646,7 +722,7 @@ class GroupTestCase(unittest.TestCase):
             pass
 
         ctx = click.Context(cli, info_name='cli')
-        output = list(ext._format_command(ctx, nested='short'))
+        output = ext._format_command(ctx, nested='short')
 
         self.assertEqual(
             textwrap.dedent(
@@ -696,8 +772,8 @@ class NestedCommandsTestCase(unittest.TestCase):
 
     maxDiff = None
 
-    @staticmethod
-    def _get_ctx():
+    @classmethod
+    def setUpClass(cls):
         @click.group()
         def cli():
             """A sample command group."""
@@ -708,7 +784,8 @@ class NestedCommandsTestCase(unittest.TestCase):
             """A sample command."""
             pass
 
-        return click.Context(cli, info_name='cli')
+        # formatting doesn't modify the context so it can be shared
+        cls.ctx = click.Context(cli, info_name='cli')
 
     def test_nested_short(self):
         """Validate a nested command with 'nested' of 'short' (default).
@@ -717,8 +794,8 @@ class NestedCommandsTestCase(unittest.TestCase):
         being handled separately.
         """
 
-        ctx = self._get_ctx()
-        output = list(ext._format_command(ctx, nested='short'))
+        ctx = self.ctx
+        output = ext._format_command(ctx, nested='short')
 
         self.assertEqual(
             textwrap.dedent(
@@ -746,8 +823,8 @@ class NestedCommandsTestCase(unittest.TestCase):
         We should not list sub-commands since they're being handled separately.
         """
 
-        ctx = self._get_ctx()
-        output = list(ext._format_command(ctx, nested='full'))
+        ctx = self.ctx
+        output = ext._format_command(ctx, nested='full')
 
         self.assertEqual(
             textwrap.dedent(
@@ -769,8 +846,8 @@ class NestedCommandsTestCase(unittest.TestCase):
         We should not list sub-commands.
         """
 
-        ctx = self._get_ctx()
-        output = list(ext._format_command(ctx, nested='none'))
+        ctx = self.ctx
+        output = ext._format_command(ctx, nested='none')
 
         self.assertEqual(
             textwrap.dedent(
@@ -792,8 +869,8 @@ class CommandFilterTestCase(unittest.TestCase):
 
     maxDiff = None
 
-    @staticmethod
-    def _get_ctx():
+    @classmethod
+    def setUpClass(cls):
         @click.group()
         def cli():
             """A sample command group."""
@@ -806,13 +883,14 @@ class CommandFilterTestCase(unittest.TestCase):
         def world():
             """A world command."""
 
-        return click.Context(cli, info_name='cli')
+        # formatting doesn't modify the context so it can be shared
+        cls.ctx = click.Context(cli, info_name='cli')
 
     def test_no_commands(self):
         """Validate an empty command group."""
 
-        ctx = self._get_ctx()
-        output = list(ext._format_command(ctx, nested='short', commands=[]))
+        ctx = self.ctx
+        output = ext._format_command(ctx, nested='short', commands=[])
 
         self.assertEqual(
             textwrap.dedent(
@@ -831,10 +909,8 @@ class CommandFilterTestCase(unittest.TestCase):
     def test_order_of_commands(self):
         """Validate the order of commands."""
 
-        ctx = self._get_ctx()
-        output = list(
-            ext._format_command(ctx, nested='short', commands=['world', 'hello'])
-        )
+        ctx = self.ctx
+        output = ext._format_command(ctx, nested='short', commands=['world', 'hello'])
 
         self.assertEqual(
             textwrap.dedent(
@@ -895,7 +971,7 @@ class CustomMultiCommandTestCase(unittest.TestCase):
 
         cli = MyCLI(help='A sample custom multicommand.')
         ctx = click.Context(cli, info_name='cli')
-        output = list(ext._format_command(ctx, nested='short'))
+        output = ext._format_command(ctx, nested='short')
 
         self.assertEqual(
             textwrap.dedent(
@@ -921,6 +997,90 @@ class CustomMultiCommandTestCase(unittest.TestCase):
             '\n'.join(output),
         )
 
+    def test_filtered(self):
+        """Ensure only the listed subcommands are loaded."""
+
+        @click.command()
+        def hello():
+            """A sample command."""
+
+        @click.command()
+        def world():
+            """A world command."""
+
+        loaded = []
+
+        class MyCLI(click.MultiCommand):
+            _command_mapping = {
+                'hello': hello,
+                'world': world,
+            }
+
+            def list_commands(self, ctx):
+                return ['hello', 'world']
+
+            def get_command(self, ctx, name):
+                loaded.append(name)
+                return self._command_mapping[name]
+
+        cli = MyCLI(help='A sample custom multicommand.')
+        ctx = click.Context(cli, info_name='cli')
+        output = ext._format_command(ctx, nested='short', commands=['world'])
+
+        self.assertEqual(
+            textwrap.dedent(
+                """
+        A sample custom multicommand.
+
+        .. program:: cli
+        .. code-block:: shell
+
+            cli [OPTIONS] COMMAND [ARGS]...
+
+        .. rubric:: Commands
+
+        .. object:: world
+
+            A world command.
+        """
+            ).lstrip(),
+            '\n'.join(output),
+        )
+        self.assertEqual(['world'], loaded)
+
+    def test_loaded_once(self):
+        """Ensure subcommands are only loaded once."""
+
+        @click.command()
+        def hello():
+            """A sample command."""
+
+        @click.command()
+        def world():
+            """A world command."""
+
+        loaded = []
+
+        class MyCLI(click.MultiCommand):
+            _command_mapping = {
+                'hello': hello,
+                'world': world,
+            }
+
+            def list_commands(self, ctx):
+                return ['hello', 'world']
+
+            def get_command(self, ctx, name):
+                loaded.append(name)
+                return self._command_mapping[name]
+
+        cli = MyCLI(help='A sample custom multicommand.')
+        ctx = click.Context(cli, info_name='cli')
+        output = ext._format_command(ctx, nested='short')
+
+        self.assertEqual(output, ext._format_command(ctx, nested='short'))
+        self.assertEqual(['hello', 'world'], loaded)
+
     def test_hidden(self):
         """Ensure 'hidden' subcommands are not shown."""
 
@@ -951,7 +1111,7 @@ class CustomMultiCommandTestCase(unittest.TestCase):
 
         cli = MyCLI(help='A sample custom multicommand.')
         ctx = click.Context(cli, info_name='cli')
-        output = list(ext._format_command(ctx, nested='short'))
+        output = ext._format_command(ctx, nested='short')
 
         # Note that we do NOT expect this to show the 'hidden' command
         self.assertEqual(
@@ -1009,7 +1169,7 @@ class CommandCollectionTestCase(unittest.TestCase):
             name='cli', sources=[grp1, grp2], help='A simple CommandCollection.'
         )
         ctx = click.Context(cli, info_name='cli')
-        output = list(ext._format_command(ctx, nested='full'))
+        output = ext._format_command(ctx, nested='full')
 
         self.assertEqual(
             textwrap.dedent(
@@ -1025,7 +1185,7 @@ class CommandCollectionTestCase(unittest.TestCase):
             '\n'.join(output),
         )
 
-        output = list(ext._format_command(ctx, nested='short'))
+        output = ext._format_command(ctx, nested='short')
 
         self.assertEqual(
             textwrap.dedent(
@@ -1075,7 +1235,7 @@ class AutoEnvvarPrefixTestCase(unittest.TestCase):
 
         cli = cli_with_auto_envvars
         ctx = click.Context(cli, info_name='cli', auto_envvar_prefix="PREFIX")
-        output = list(ext._format_command(ctx, nested='full'))
+        output = ext._format_command(ctx, nested='full')
 
         self.assertEqual(
             textwrap.dedent(
@@ -1127,3 +1287,8 @@ class AutoEnvvarPrefixTestCase(unittest.TestCase):
             ).lstrip(),
             '\n'.join(output),
         )
+
+        # the automatic envvars must not be stored on the parameters themselves
+        self.assertEqual(
+            [None, None, 'EXPLICIT_ENVVAR'], [param.envvar for param in cli.params]
+        )